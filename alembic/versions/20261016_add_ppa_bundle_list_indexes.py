@@ -0,0 +1,42 @@
+# alembic/versions/20261016_add_ppa_bundle_list_indexes.py
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261016_add_ppa_bundle_list_indexes"
+down_revision = "64cfbdb3686e"
+branch_labels = None
+depends_on = None
+
+
+# (name, columns, single-column index it replaces) — match the filter + ORDER BY of GET /ppa_quotations
+INDEXES = [
+    ("ix_ppa_bundles_updated_at_id", ["updated_at DESC", "id DESC"], None),
+    ("ix_ppa_bundles_customer_updated", ["customer_id", "updated_at DESC"], "ix_ppa_bundles_customer_id"),
+    ("ix_ppa_bundles_agency_updated", ["agency_id", "updated_at DESC"], "ix_ppa_bundles_agency_id"),
+    ("ix_ppa_bundles_area_updated", ["area", "updated_at DESC"], None),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    idxs = {ix["name"] for ix in insp.get_indexes("ppa_bundles")}
+
+    for name, cols, old in INDEXES:
+        if name not in idxs:
+            op.create_index(name, "ppa_bundles", [sa.text(c) for c in cols], unique=False)
+        # same leading column -> the old single-column index is redundant
+        if old is not None and old in idxs:
+            op.drop_index(old, table_name="ppa_bundles")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    idxs = {ix["name"] for ix in insp.get_indexes("ppa_bundles")}
+
+    for name, cols, old in reversed(INDEXES):
+        if old is not None and old not in idxs:
+            op.create_index(old, "ppa_bundles", [cols[0]], unique=False)
+        if name in idxs:
+            op.drop_index(name, table_name="ppa_bundles")
@@ -0,0 +1,41 @@
+# alembic/versions/20261016_add_ppa_covering_indexes.py
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261016_add_ppa_covering_indexes"
+down_revision = "20261016_add_ppa_bundle_list_indexes"
+branch_labels = None
+depends_on = None
+
+
+# (table, new covering index, key column, INCLUDE columns, single-column index it replaces)
+COVERING = [
+    ("ppa_supply_points", "ix_ppa_sp_bundle_contract", "bundle_id", ["contract_kw"], "ix_ppa_supply_points_bundle_id"),
+    ("ppa_supply_points", "ix_ppa_sp_project_contract", "project_id", ["contract_kw"], "ix_ppa_supply_points_project_id"),
+    ("ppa_projects", "ix_ppa_projects_bundle_capacity", "bundle_id", ["capacity_mw"], "ix_ppa_projects_bundle_id"),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    for table, name, col, include, old in COVERING:
+        idxs = {ix["name"] for ix in insp.get_indexes(table)}
+        if name not in idxs:
+            op.create_index(name, table, [col], unique=False, postgresql_include=include)
+        # the covering index has the same leading column -> the old one is redundant
+        if old in idxs:
+            op.drop_index(old, table_name=table)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    for table, name, col, _, old in reversed(COVERING):
+        idxs = {ix["name"] for ix in insp.get_indexes(table)}
+        if old not in idxs:
+            op.create_index(old, table, [col], unique=False)
+        if name in idxs:
+            op.drop_index(name, table_name=table)
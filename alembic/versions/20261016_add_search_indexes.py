@@ -0,0 +1,25 @@
+# alembic/versions/20261016_add_search_indexes.py
+from alembic import op
+
+revision = "20261016_add_search_indexes"
+down_revision = "20261016_ppa_bundle_aggregates"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # customers.name ILIKE '%foo%' (list filter ?customer_name=)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_customers_name_trgm ON customers USING gin (name gin_trgm_ops)")
+
+    # lower(supply_point_number) LIKE 'abc%' (list filter ?supply_point_number=)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_ppa_sp_number_lower "
+        "ON ppa_supply_points (lower(supply_point_number) text_pattern_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_ppa_sp_number_lower")
+    op.execute("DROP INDEX IF EXISTS ix_customers_name_trgm")
+    # pg_trgm is left installed (other objects may depend on it)
@@ -0,0 +1,41 @@
+# alembic/versions/20261016_create_v_ppa_quotation_list.py
+from alembic import op
+
+revision = "20261016_create_v_ppa_quotation_list"
+down_revision = "20261016_add_ppa_covering_indexes"
+branch_labels = None
+depends_on = None
+
+
+# Aggregates are correlated subqueries (not JOIN + GROUP BY) so the view stays "simple":
+# PostgreSQL inlines it, pushes the list filters down to ppa_bundles and only evaluates
+# the subqueries for rows that survive ORDER BY ... LIMIT.
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE VIEW v_ppa_quotation_list AS
+        SELECT
+            b.id,
+            b.customer_id,
+            b.agency_id,
+            b.plan_id,
+            b.area,
+            b.requested_at,
+            b.request_due_date,
+            b.quote_valid_days,
+            b.contract_start_date,
+            b.quote_status,
+            b.offer_status,
+            b.updated_at,
+            (SELECT count(*) FROM ppa_projects p WHERE p.bundle_id = b.id) AS project_count,
+            (SELECT count(*) FROM ppa_supply_points sp WHERE sp.bundle_id = b.id) AS num_of_spids,
+            (SELECT COALESCE(SUM(sp.contract_kw), 0) FROM ppa_supply_points sp WHERE sp.bundle_id = b.id)
+                AS contract_power_kw,
+            b.requested_at + NULLIF(b.quote_valid_days, 0) AS expiration_date
+        FROM ppa_bundles b
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS v_ppa_quotation_list")
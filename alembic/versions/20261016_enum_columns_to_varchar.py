@@ -0,0 +1,126 @@
+# alembic/versions/20261016_enum_columns_to_varchar.py
+from alembic import op
+
+revision = "20261016_enum_columns_to_varchar"
+down_revision = "20261016_create_v_ppa_quotation_list"
+branch_labels = None
+depends_on = None
+
+
+# (table, column, check name, allowed values) — values mirror the Enum classes in app.models
+_VARCHAR_COLUMNS = [
+    ("contracts", "status", "ck_contract_status",
+     ["UNDER_CONTRACT", "RECONTRACT_ESTIMATE", "RECONTRACTED"]),
+    ("ancillary_contracts", "type", "ck_ancillary_contract_type",
+     ["STANDBY_POWER", "STANDBY_LINE", "PRIVATE_POWER_SUPPLY", "NON_FOSSIL_CERT",
+      "RENEWABLE_LEVY_REDUCTION", "ENECLOUD_DISCOUNT"]),
+    ("ppa_bundles", "voltage", "ck_ppa_bundle_voltage", ["HIGH", "EXTRA_HIGH", "LOW"]),
+    ("ppa_bundles", "quote_status", "ck_ppa_bundle_quote_status",
+     ["DRAFT", "SUBMITTED", "PRICED", "EXCEL_READY"]),
+    ("ppa_bundles", "offer_status", "ck_ppa_bundle_offer_status", ["NONE", "OFFERED", "WON", "LOST"]),
+]
+
+# native enum type each column used before, recreated on downgrade
+_ENUM_TYPES = {
+    ("contracts", "status"): "contractstatus",
+    ("ancillary_contracts", "type"): "ancillarytype",
+    ("ppa_bundles", "voltage"): "voltagelevel",
+    ("ppa_bundles", "quote_status"): "ppaqstatus",
+    ("ppa_bundles", "offer_status"): "ppaofferstatus",
+}
+
+# server defaults from 20251009; dropped around each type change and put back afterwards
+_DEFAULTS = {
+    ("ppa_bundles", "quote_status"): "DRAFT",
+    ("ppa_bundles", "offer_status"): "NONE",
+}
+
+# older migrations created these under different names; drop whichever exist
+_OLD_TYPE_NAMES = [
+    "contractstatus", "ancillarytype", "quoteeffectivedays",
+    "voltagelevel", "ppaqstatus", "ppaofferstatus", "quotestatus", "offerstatus",
+]
+
+_VIEW_SQL = """
+    CREATE OR REPLACE VIEW v_ppa_quotation_list AS
+    SELECT
+        b.id,
+        b.customer_id,
+        b.agency_id,
+        b.plan_id,
+        b.area,
+        b.requested_at,
+        b.request_due_date,
+        b.quote_valid_days,
+        b.contract_start_date,
+        b.quote_status,
+        b.offer_status,
+        b.updated_at,
+        (SELECT count(*) FROM ppa_projects p WHERE p.bundle_id = b.id) AS project_count,
+        (SELECT count(*) FROM ppa_supply_points sp WHERE sp.bundle_id = b.id) AS num_of_spids,
+        (SELECT COALESCE(SUM(sp.contract_kw), 0) FROM ppa_supply_points sp WHERE sp.bundle_id = b.id)
+            AS contract_power_kw,
+        b.requested_at + NULLIF(b.quote_valid_days, 0) AS expiration_date
+    FROM ppa_bundles b
+"""
+
+
+def _in_list(values) -> str:
+    return ", ".join(f"'{v}'" for v in values)
+
+
+def upgrade() -> None:
+    # the view depends on quote_status / offer_status -> can't ALTER TYPE underneath it
+    op.execute("DROP VIEW IF EXISTS v_ppa_quotation_list")
+
+    for table, column, ck_name, values in _VARCHAR_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR(32) USING {column}::text")
+        if (table, column) in _DEFAULTS:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{_DEFAULTS[(table, column)]}'")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {ck_name} CHECK ({column} IN ({_in_list(values)}))")
+
+    # enum was stored by member NAME ('DAYS_30' / 'DAYS_60') -> store the day count itself
+    op.execute(
+        """
+        ALTER TABLE recontract_estimates ALTER COLUMN quote_effective_days TYPE INTEGER
+        USING CASE quote_effective_days::text WHEN 'DAYS_30' THEN 30 WHEN 'DAYS_60' THEN 60 END
+        """
+    )
+    op.execute(
+        "ALTER TABLE recontract_estimates ADD CONSTRAINT ck_recontract_estimate_quote_effective_days "
+        "CHECK (quote_effective_days IN (30, 60))"
+    )
+
+    for type_name in _OLD_TYPE_NAMES:
+        op.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+    op.execute(_VIEW_SQL)
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS v_ppa_quotation_list")
+
+    op.execute("ALTER TABLE recontract_estimates DROP CONSTRAINT IF EXISTS ck_recontract_estimate_quote_effective_days")
+    op.execute("CREATE TYPE quoteeffectivedays AS ENUM ('DAYS_30', 'DAYS_60')")
+    op.execute(
+        """
+        ALTER TABLE recontract_estimates ALTER COLUMN quote_effective_days TYPE quoteeffectivedays
+        USING ('DAYS_' || quote_effective_days)::quoteeffectivedays
+        """
+    )
+
+    for table, column, ck_name, values in _VARCHAR_COLUMNS:
+        type_name = _ENUM_TYPES[(table, column)]
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {ck_name}")
+        op.execute(f"CREATE TYPE {type_name} AS ENUM ({_in_list(values)})")
+        # a VARCHAR default can't be cast to the enum automatically -> drop, convert, re-add
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name}")
+        if (table, column) in _DEFAULTS:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} "
+                f"SET DEFAULT '{_DEFAULTS[(table, column)]}'::{type_name}"
+            )
+
+    op.execute(_VIEW_SQL)
@@ -0,0 +1,58 @@
+# alembic/versions/20261016_float_columns_to_numeric.py
+from alembic import op
+
+revision = "20261016_float_columns_to_numeric"
+down_revision = "20261016_add_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+# (table, column) stored as double precision until now
+_COLUMNS = [
+    ("contracts", "negotiated_power_kw"),
+    ("ancillary_contracts", "unit_price"),
+    ("recontract_plants", "capacity_mw"),
+    ("recontract_plants", "ppa_unit_price_yen_per_kwh"),
+    ("ppa_projects", "capacity_mw"),
+    ("ppa_projects", "ppa_unit_price_yen_per_kwh"),
+    ("ppa_supply_points", "contract_kw"),
+    ("ppa_bundles", "contract_power_kw"),
+]
+
+_VIEW_SQL = """
+    CREATE VIEW v_ppa_quotation_list AS
+    SELECT
+        b.id,
+        b.customer_id,
+        b.agency_id,
+        b.plan_id,
+        b.area,
+        b.requested_at,
+        b.request_due_date,
+        b.quote_valid_days,
+        b.contract_start_date,
+        b.quote_status,
+        b.offer_status,
+        b.updated_at,
+        b.project_count,
+        b.num_of_spids,
+        b.contract_power_kw,
+        b.requested_at + NULLIF(b.quote_valid_days, 0) AS expiration_date
+    FROM ppa_bundles b
+"""
+
+
+def _alter(type_sql: str) -> None:
+    # the view selects ppa_bundles.contract_power_kw -> recreate it around the type change
+    op.execute("DROP VIEW IF EXISTS v_ppa_quotation_list")
+    for table, column in _COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_sql} USING {column}::{type_sql}")
+    op.execute(_VIEW_SQL)
+
+
+def upgrade() -> None:
+    _alter("NUMERIC(12, 4)")
+
+
+def downgrade() -> None:
+    _alter("DOUBLE PRECISION")
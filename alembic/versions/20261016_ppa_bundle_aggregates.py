@@ -0,0 +1,134 @@
+# alembic/versions/20261016_ppa_bundle_aggregates.py
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261016_ppa_bundle_aggregates"
+down_revision = "20261016_enum_columns_to_varchar"
+branch_labels = None
+depends_on = None
+
+
+_CHILD_TABLES = ["ppa_projects", "ppa_supply_points"]
+
+# (trigger suffix, event, transition tables)
+_EVENTS = [
+    ("ins", "INSERT", "REFERENCING NEW TABLE AS new_rows"),
+    ("upd", "UPDATE", "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    ("del", "DELETE", "REFERENCING OLD TABLE AS old_rows"),
+]
+
+
+def _create_view(project_count: str, num_of_spids: str, contract_power_kw: str) -> None:
+    op.execute(
+        f"""
+        CREATE VIEW v_ppa_quotation_list AS
+        SELECT
+            b.id,
+            b.customer_id,
+            b.agency_id,
+            b.plan_id,
+            b.area,
+            b.requested_at,
+            b.request_due_date,
+            b.quote_valid_days,
+            b.contract_start_date,
+            b.quote_status,
+            b.offer_status,
+            b.updated_at,
+            {project_count} AS project_count,
+            {num_of_spids} AS num_of_spids,
+            {contract_power_kw} AS contract_power_kw,
+            b.requested_at + NULLIF(b.quote_valid_days, 0) AS expiration_date
+        FROM ppa_bundles b
+        """
+    )
+
+
+def upgrade() -> None:
+    op.add_column("ppa_bundles", sa.Column("project_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("ppa_bundles", sa.Column("num_of_spids", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("ppa_bundles", sa.Column("contract_power_kw", sa.Float(), nullable=False, server_default="0"))
+
+    # Recompute all three aggregates for the given bundles (used for backfill and by the triggers).
+    # Lock the bundle rows first, in a separate statement: under READ COMMITTED the UPDATE then
+    # takes a fresh snapshot that includes children committed by whoever held the lock before us.
+    # (Locking inside the UPDATE itself would re-check the row but still run the subqueries with
+    # the old snapshot -> lost counts.) ORDER BY id keeps multi-bundle statements deadlock-free.
+    # NO KEY UPDATE (what the UPDATE itself takes), not FOR UPDATE: the child insert's FK check
+    # already holds FOR KEY SHARE on the bundle, which FOR UPDATE would conflict with -> deadlock.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ppa_refresh_bundle_aggregates(bundle_ids integer[]) RETURNS void
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM 1 FROM ppa_bundles WHERE id = ANY(bundle_ids) ORDER BY id FOR NO KEY UPDATE;
+
+            UPDATE ppa_bundles b SET
+                project_count = (SELECT count(*) FROM ppa_projects p WHERE p.bundle_id = b.id),
+                num_of_spids = (SELECT count(*) FROM ppa_supply_points sp WHERE sp.bundle_id = b.id),
+                contract_power_kw = (
+                    SELECT COALESCE(SUM(sp.contract_kw), 0) FROM ppa_supply_points sp WHERE sp.bundle_id = b.id
+                )
+            WHERE b.id = ANY(bundle_ids);
+        END
+        $$
+        """
+    )
+
+    # Statement-level: a bulk insert of N supply points refreshes each touched bundle once, not N times
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ppa_bundle_aggregates_trg() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM ppa_refresh_bundle_aggregates(ARRAY(SELECT DISTINCT bundle_id FROM new_rows));
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM ppa_refresh_bundle_aggregates(ARRAY(SELECT DISTINCT bundle_id FROM old_rows));
+            ELSE
+                PERFORM ppa_refresh_bundle_aggregates(
+                    ARRAY(SELECT bundle_id FROM old_rows UNION SELECT bundle_id FROM new_rows)
+                );
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+
+    for table in _CHILD_TABLES:
+        for suffix, event, referencing in _EVENTS:
+            op.execute(
+                f"""
+                CREATE TRIGGER trg_{table}_bundle_agg_{suffix}
+                AFTER {event} ON {table}
+                {referencing}
+                FOR EACH STATEMENT EXECUTE FUNCTION ppa_bundle_aggregates_trg()
+                """
+            )
+
+    # backfill existing bundles
+    op.execute("SELECT ppa_refresh_bundle_aggregates(ARRAY(SELECT id FROM ppa_bundles))")
+
+    # the view now just reads the stored columns (no per-row subqueries)
+    op.execute("DROP VIEW IF EXISTS v_ppa_quotation_list")
+    _create_view("b.project_count", "b.num_of_spids", "b.contract_power_kw")
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS v_ppa_quotation_list")
+    _create_view(
+        "(SELECT count(*) FROM ppa_projects p WHERE p.bundle_id = b.id)",
+        "(SELECT count(*) FROM ppa_supply_points sp WHERE sp.bundle_id = b.id)",
+        "(SELECT COALESCE(SUM(sp.contract_kw), 0) FROM ppa_supply_points sp WHERE sp.bundle_id = b.id)",
+    )
+
+    for table in _CHILD_TABLES:
+        for suffix, _event, _referencing in _EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_bundle_agg_{suffix} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS ppa_bundle_aggregates_trg()")
+    op.execute("DROP FUNCTION IF EXISTS ppa_refresh_bundle_aggregates(integer[])")
+
+    op.drop_column("ppa_bundles", "contract_power_kw")
+    op.drop_column("ppa_bundles", "num_of_spids")
+    op.drop_column("ppa_bundles", "project_count")
@@ -0,0 +1,58 @@
+# alembic/versions/20261016_ppa_bundle_expiration_date.py
+from alembic import op
+
+revision = "20261016_ppa_bundle_expiration_date"
+down_revision = "20261016_float_columns_to_numeric"
+branch_labels = None
+depends_on = None
+
+
+def _create_view(expiration_date: str, quote_valid_until: str = "") -> None:
+    op.execute(
+        f"""
+        CREATE VIEW v_ppa_quotation_list AS
+        SELECT
+            b.id,
+            b.customer_id,
+            b.agency_id,
+            b.plan_id,
+            b.area,
+            b.requested_at,
+            b.request_due_date,
+            b.quote_valid_days,
+            b.contract_start_date,
+            b.quote_status,
+            b.offer_status,
+            b.updated_at,
+            b.project_count,
+            b.num_of_spids,
+            b.contract_power_kw,
+            {expiration_date} AS expiration_date{quote_valid_until}
+        FROM ppa_bundles b
+        """
+    )
+
+
+def upgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS v_ppa_quotation_list")
+
+    # computed once on INSERT/UPDATE instead of on every read
+    op.execute(
+        "ALTER TABLE ppa_bundles ADD COLUMN expiration_date DATE "
+        "GENERATED ALWAYS AS (requested_at + NULLIF(quote_valid_days, 0)) STORED"
+    )
+
+    # to_char() isn't IMMUTABLE, so the display string lives in the view rather than the table
+    _create_view(
+        "b.expiration_date",
+        """,
+            CASE WHEN b.expiration_date IS NULL THEN ''
+                 ELSE to_char(b.expiration_date, 'YYYY-MM-DD') || ' (' || b.quote_valid_days || '日)'
+            END AS quote_valid_until""",
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS v_ppa_quotation_list")
+    op.execute("ALTER TABLE ppa_bundles DROP COLUMN IF EXISTS expiration_date")
+    _create_view("b.requested_at + NULLIF(b.quote_valid_days, 0)")
@@ -0,0 +1,39 @@
+# alembic/versions/20261016_ppa_bundle_list_version.py
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261016_ppa_bundle_list_version"
+down_revision = "20261016_ppa_bundle_expiration_date"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # bumped (transactionally) on every UPDATE of a bundle row — ORM or raw SQL, and the
+    # aggregate refresh after project / SP changes — so the list cache stamp sees it.
+    # (updated_at can't: it's the transaction start time, so a late commit doesn't move max().)
+    op.add_column("ppa_bundles", sa.Column("list_version", sa.BigInteger(), nullable=False, server_default="0"))
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ppa_bundle_list_version_trg() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.list_version := OLD.list_version + 1;
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_ppa_bundles_list_version
+        BEFORE UPDATE ON ppa_bundles
+        FOR EACH ROW EXECUTE FUNCTION ppa_bundle_list_version_trg()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_ppa_bundles_list_version ON ppa_bundles")
+    op.execute("DROP FUNCTION IF EXISTS ppa_bundle_list_version_trg()")
+    op.drop_column("ppa_bundles", "list_version")
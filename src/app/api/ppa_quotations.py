@@ -1,26 +1,28 @@
 # src/app/api/ppa_quotations.py
 from __future__ import annotations
 
-from datetime import date, timedelta
-from typing import Optional, List, Tuple
+from datetime import date, datetime
+from typing import Any, Dict, Optional, List, Tuple
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 import sqlalchemy as sa
-from sqlalchemy import func, literal_column
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import cache_get, cache_key, cache_set
 from app.db import get_session
+from app.lookups import lookups
+from app.settings import settings
 from app.models import (
     PpaBundle,
     PpaProject,
     PpaSupplyPoint,
-    Plan,
     Customer,
-    Agency,
+    ppa_quotation_list_view,
 )
 from app.schemas_ppa_quotations import (
     PpaQuotationListResponse,
-    PpaQuotationListItem,
     PpaQuotationDetail,
     PpaQuotationDetailProject,
 )
@@ -28,18 +30,52 @@ from app.schemas_ppa_quotations import (
 router = APIRouter(prefix="/ppa_quotations", tags=["projects"])
 
 
+# One row per bundle with project/SP aggregates, expiration_date and quote_valid_until computed by the DB
+V = ppa_quotation_list_view
+
+# Allowed ?sort_by= values -> real columns (never interpolate user input into SQL)
+SORT_COLS = {
+    "updated_at": V.c.updated_at,
+    "quote_request_date": V.c.requested_at,
+    "contract_start_date": V.c.contract_start_date,
+    # names aren't joined any more (see app.lookups) -> correlated lookup only when sorting by it
+    "customer_name": sa.select(Customer.name).where(Customer.id == V.c.customer_id).scalar_subquery(),
+    "id": V.c.id,
+}
+
+# Header columns shared by the list and detail queries
+HEADER_COLS = (
+    V.c.id,
+    V.c.plan_id,
+    V.c.customer_id,
+    V.c.agency_id,
+    V.c.area,
+    V.c.requested_at,
+    V.c.request_due_date,
+    V.c.quote_valid_days,
+    V.c.contract_start_date,
+    V.c.quote_status,
+    V.c.offer_status,
+    V.c.updated_at,
+    V.c.num_of_spids,
+    V.c.contract_power_kw,
+    V.c.expiration_date,
+    V.c.quote_valid_until,
+)
+
+# bound once: the detail endpoint builds one of these per project row
+_construct_project = PpaQuotationDetailProject.model_construct
+
+
 # ---------------------- helpers ---------------------- #
 
-def _format_quote_valid_until(requested_at: Optional[date], days: Optional[int]) -> Tuple[str, Optional[date]]:
-    """
-    Return ('YYYY-MM-DD (N日)', expiration_date) given a base date and a validity window in days.
-    If requested_at or days is None, returns ('', None).
-    """
-    if not requested_at or not days:
-        return ("", None)
-    exp = requested_at + timedelta(days=int(days))
-    label = f"{exp.strftime('%Y-%m-%d')} ({int(days)}日)"
-    return (label, exp)
+def _parse_cursor(after: str) -> Tuple[datetime, int]:
+    """'<updated_at ISO>_<id>' -> (updated_at, id); 400 on anything else."""
+    try:
+        ts, _, bundle_id = after.rpartition("_")
+        return datetime.fromisoformat(ts), int(bundle_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {after}")
 
 
 def _summary_number(bundle_id: int) -> str:
@@ -47,6 +83,46 @@ def _summary_number(bundle_id: int) -> str:
     return f"PPA{bundle_id:08d}"
 
 
+def _header_fields(r: Any) -> Dict[str, Any]:
+    """
+    Map one HEADER_COLS row to the fields shared by PpaQuotationListItem / PpaQuotationDetail.
+    Names must already be in `lookups` (call lookups.ensure first).
+    """
+    plan_name = lookups.plans.get(r.plan_id, "")
+    return dict(
+        id=r.id,
+        tender_number=_summary_number(r.id),   # show same on both fields for now
+        customer_name=lookups.customers.get(r.customer_id, ""),
+        plan_id=r.plan_id,
+        plan_name_en=plan_name,
+        plan_name_jp=plan_name,
+        sales_agent_id=r.agency_id,
+        sales_agent_name=lookups.agencies.get(r.agency_id) if r.agency_id is not None else None,
+        region_id=None,  # not modeled separately
+        region_name_en=r.area,
+        region_name_jp=r.area,
+        quote_request_date=r.requested_at,
+        last_date_for_quotation=r.request_due_date,
+        quote_valid_until=r.quote_valid_until,  # formatted by the view
+        contract_start_date=r.contract_start_date,
+        num_of_spids=int(r.num_of_spids or 0),
+        peak_demand=None,
+        annual_usage=None,
+        pricing_status_id=1 if str(r.quote_status or "").lower() in ("pending", "draft", "") else 2,
+        pricing_status_en=str(r.quote_status or "pending").lower(),
+        pricing_status_jp="保留中" if str(r.quote_status or "").lower() in ("pending", "draft", "") else "暫定",
+        # DRAFT / NONE are the "nothing happened yet" states -> pending (1 / 保留中)
+        offer_status_id=1 if str(r.offer_status or "").lower() in ("pending", "none", "") else 2,
+        offer_status_en=str(r.offer_status or "pending").lower(),
+        offer_status_jp="保留中" if str(r.offer_status or "").lower() in ("pending", "none", "") else "確定",
+        last_updated=(r.updated_at or date.today()).strftime("%Y-%m-%d %H:%M") if hasattr(r.updated_at, "strftime") else "—",
+        has_quotation_file=False,
+        summary_number=_summary_number(r.id),
+        contract_power_kw=float(r.contract_power_kw or 0),  # Decimal -> JSON number
+        expiration_date=r.expiration_date,
+    )
+
+
 # ---------------------- list endpoint ---------------------- #
 
 @router.get("", response_model=PpaQuotationListResponse)
@@ -60,134 +136,122 @@ async def list_ppa_quotations(
     customer_id: Optional[int] = None,
     agency_id: Optional[int] = None,
     region: Optional[str] = None,
+    customer_name: Optional[str] = None,          # substring, case-insensitive
+    supply_point_number: Optional[str] = None,    # prefix, case-insensitive
+    # keyset cursor from the previous page's next_cursor (replaces `page` for deep paging)
+    after: Optional[str] = Query(None, description="next_cursor of the previous page: '<updated_at>_<id>'"),
 ):
     """
     BizQ-like list with a couple of extra PPA fields (summary_number, project_count, contract_power_kw, expiration_date).
     """
-    # base sub-select to compute counts and totals
-    sp_count = func.count(PpaSupplyPoint.id).label("sp_count")
-    sum_kw = func.coalesce(func.sum(PpaSupplyPoint.contract_kw), 0.0).label("sum_kw")
-    proj_count = func.count(sa.distinct(PpaProject.id)).label("project_count")
+    # sorting (whitelisted column objects keep the statement text stable / cacheable)
+    sort_col = SORT_COLS.get((sort_by or "").lower(), V.c.updated_at)
+    ascending = (sort_order or "").lower() == "asc"
+    order = sort_col.asc() if ascending else sort_col.desc()
+    # cursors follow the (updated_at DESC, id DESC) index order only
+    keyset = sort_col is V.c.updated_at and not ascending
 
-    stmt = (
-        sa.select(
-            PpaBundle.id.label("bundle_id"),                          # <-- real column
-            Plan.id.label("plan_id"),
-            Plan.name.label("plan_name_en"),
-            Plan.name.label("plan_name_jp"),
-            Customer.name.label("customer_name"),
-            Agency.id.label("sales_agent_id"),
-            Agency.name.label("sales_agent_name"),
-            PpaBundle.area.label("region_name_en"),
-            PpaBundle.area.label("region_name_jp"),
-            PpaBundle.requested_at.label("requested_at"),
-            PpaBundle.request_due_date.label("request_due_date"),
-            PpaBundle.quote_valid_days.label("quote_valid_days"),
-            PpaBundle.contract_start_date.label("contract_start_date"),
-            PpaBundle.quote_status.label("quote_status"),
-            PpaBundle.offer_status.label("offer_status"),
-            PpaBundle.updated_at.label("updated_at"),
-            sp_count,
-            sum_kw,
-            proj_count,
-        )
-        .join(Plan, Plan.id == PpaBundle.plan_id)
-        .join(Customer, Customer.id == PpaBundle.customer_id)
-        .outerjoin(Agency, Agency.id == PpaBundle.agency_id)
-        .outerjoin(PpaProject, PpaProject.bundle_id == PpaBundle.id)
-        .outerjoin(PpaSupplyPoint, PpaSupplyPoint.bundle_id == PpaBundle.id)
-        .group_by(
-            PpaBundle.id,
-            Plan.id, Plan.name,
-            Customer.name,
-            Agency.id, Agency.name,
-            PpaBundle.area,
-            PpaBundle.requested_at,
-            PpaBundle.request_due_date,
-            PpaBundle.quote_valid_days,
-            PpaBundle.contract_start_date,
-            PpaBundle.quote_status,
-            PpaBundle.offer_status,
-            PpaBundle.updated_at,
-        )
-    )
+    cursor = None
+    if after:
+        if not keyset:
+            raise HTTPException(status_code=400, detail="after is only supported with sort_by=updated_at&sort_order=desc")
+        cursor = _parse_cursor(after)
 
+    filters = []
     if customer_id is not None:
-        stmt = stmt.where(PpaBundle.customer_id == customer_id)
+        filters.append(V.c.customer_id == customer_id)
     if agency_id is not None:
-        stmt = stmt.where(PpaBundle.agency_id == agency_id)
+        filters.append(V.c.agency_id == agency_id)
     if region:
-        stmt = stmt.where(PpaBundle.area == region)
-
-    # totals
-    total_q = sa.select(func.count()).select_from(PpaBundle)
-    total_count = (await session.execute(total_q)).scalar_one()
-
-    # filtered totals (count distinct bundles in the list query)
-    filtered_q = sa.select(func.count()).select_from(stmt.subquery())
-    filtered_count = (await session.execute(filtered_q)).scalar_one()
-
-    # sorting
-    sort_map = {
-        "updated_at": literal_column("updated_at"),
-        "contract_start_date": literal_column("contract_start_date"),
-        "customer_name": literal_column("customer_name"),
-    }
-    sort_col = sort_map.get((sort_by or "").lower(), literal_column("updated_at"))
-    if (sort_order or "").lower() == "asc":
-        stmt = stmt.order_by(sort_col.asc())
-    else:
-        stmt = stmt.order_by(sort_col.desc())
+        filters.append(V.c.area == region)
+    if customer_name:
+        # name ILIKE '%..%' -> ix_customers_name_trgm
+        filters.append(
+            V.c.customer_id.in_(
+                sa.select(Customer.id).where(Customer.name.icontains(customer_name, autoescape=True))
+            )
+        )
+    if supply_point_number:
+        # lower(spn) LIKE 'abc%' -> ix_ppa_sp_number_lower
+        filters.append(
+            V.c.id.in_(
+                sa.select(PpaSupplyPoint.bundle_id).where(
+                    func.lower(PpaSupplyPoint.supply_point_number).startswith(
+                        supply_point_number.lower(), autoescape=True
+                    )
+                )
+            )
+        )
+
+    # Keyset pages skip both counts (the client got them with the first page) and the cache (its
+    # version stamp is the same full scan), so a deep page costs one index seek.
+    key = None
+    total_count = filtered_count = None
+    if cursor is None:
+        # total + cache version stamp in one round-trip: inserts bump max(updated_at), deletes change
+        # the count, any bundle UPDATE (incl. the aggregate recompute on project / SP edits) bumps
+        # list_version. updated_at alone isn't enough: it's the transaction start time.
+        total_q = sa.select(func.count(), func.max(PpaBundle.updated_at), func.sum(PpaBundle.list_version))
+        total_count, max_updated, list_version = (await session.execute(total_q)).one()
+
+        key = cache_key(
+            "ppa_quotations",
+            page, rows, sort_by, sort_order, customer_id, agency_id, region, customer_name, supply_point_number,
+            total_count, max_updated, list_version,
+        )
+        cached = await cache_get(key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
 
-    # paging
-    stmt = stmt.limit(rows).offset((page - 1) * rows)
+        filtered_q = sa.select(func.count()).select_from(V).where(*filters)
+        filtered_count = (await session.execute(filtered_q)).scalar_one()
 
+    # one statement against the view: bundle columns + per-bundle aggregates, paged
+    stmt = (
+        sa.select(*HEADER_COLS, V.c.project_count)
+        .where(*filters)
+        .order_by(order, V.c.id.desc())
+        .limit(rows)
+    )
+    if cursor is not None:
+        # seek straight past the last row seen (ix_ppa_bundles_updated_at_id) instead of OFFSET
+        stmt = stmt.where(sa.tuple_(V.c.updated_at, V.c.id) < cursor)
+    else:
+        stmt = stmt.offset((page - 1) * rows)
     rows_ = (await session.execute(stmt)).all()
 
-    data: List[PpaQuotationListItem] = []
-    for r in rows_:
-        # map quote_valid_until label & expiration_date
-        label, exp_date = _format_quote_valid_until(r.requested_at, r.quote_valid_days)
-
-        item = PpaQuotationListItem(
-            id=r.bundle_id,
-            tender_number=_summary_number(r.bundle_id),   # show same on both fields for now
-            customer_name=r.customer_name,
-            plan_id=r.plan_id,
-            plan_name_en=r.plan_name_en,
-            plan_name_jp=r.plan_name_jp,
-            sales_agent_id=r.sales_agent_id,
-            sales_agent_name=r.sales_agent_name,
-            region_id=None,  # not modeled separately
-            region_name_en=r.region_name_en,
-            region_name_jp=r.region_name_jp,
-            quote_request_date=r.requested_at,
-            last_date_for_quotation=r.request_due_date,
-            quote_valid_until=label,
-            contract_start_date=r.contract_start_date,
-            num_of_spids=int(r.sp_count or 0),
-            peak_demand=None,
-            annual_usage=None,
-            pricing_status_id=1 if str(r.quote_status or "").lower() in ("pending", "draft", "") else 2,
-            pricing_status_en=str(r.quote_status or "pending").lower(),
-            pricing_status_jp="保留中" if str(r.quote_status or "").lower() in ("pending", "draft", "") else "暫定",
-            offer_status_id=1 if str(r.offer_status or "").lower() in ("pending", "") else 2,
-            offer_status_en=str(r.offer_status or "pending").lower(),
-            offer_status_jp="保留中" if str(r.offer_status or "").lower() in ("pending", "") else "確定",
-            last_updated=(r.updated_at or date.today()).strftime("%Y-%m-%d %H:%M") if hasattr(r.updated_at, "strftime") else "—",
-            has_quotation_file=False,
-            summary_number=_summary_number(r.bundle_id),
-            project_count=int(r.project_count or 0),
-            contract_power_kw=float(r.sum_kw or 0.0),
-            expiration_date=exp_date,
-        )
-        data.append(item)
+    next_cursor = None
+    if keyset and len(rows_) == rows:
+        last = rows_[-1]
+        next_cursor = f"{last.updated_at.isoformat()}_{last.id}"
+
+    # plan / customer / agency names come from the in-process cache instead of JOINs
+    await lookups.ensure(
+        session,
+        plan_ids=(r.plan_id for r in rows_),
+        customer_ids=(r.customer_id for r in rows_),
+        agency_ids=(r.agency_id for r in rows_),
+    )
+
+    # rows come from our own DB with known types -> plain dicts straight to orjson
+    # (returning a Response skips FastAPI's response_model re-validation + jsonable_encoder;
+    #  response_model stays on the route for the OpenAPI docs)
+    data: List[Dict[str, Any]] = [
+        {**_header_fields(r), "project_count": int(r.project_count or 0)}
+        for r in rows_
+    ]
 
-    return PpaQuotationListResponse(
-        total_count=int(total_count or 0),
-        filtered_count=int(filtered_count or 0),
-        data=data,
+    body = orjson.dumps(
+        {
+            "total_count": int(total_count or 0) if cursor is None else None,
+            "filtered_count": int(filtered_count or 0) if cursor is None else None,
+            "data": data,
+            "next_cursor": next_cursor,
+        }
     )
+    if key is not None:
+        await cache_set(key, body, settings.list_cache_ttl)
+    return Response(content=body, media_type="application/json")
 
 
 # ---------------------- detail endpoint ---------------------- #
@@ -201,65 +265,27 @@ async def get_ppa_quotation_detail(
     Header info for the bundle + per-project aggregation (capacity split).
     """
     # header
-    sp_count = func.count(PpaSupplyPoint.id).label("sp_count")
-    sum_kw = func.coalesce(func.sum(PpaSupplyPoint.contract_kw), 0.0).label("sum_kw")
-
-    hdr_stmt = (
-        sa.select(
-            PpaBundle.id.label("bundle_id"),
-            Plan.id.label("plan_id"),
-            Plan.name.label("plan_name_en"),
-            Plan.name.label("plan_name_jp"),
-            Customer.name.label("customer_name"),
-            Agency.id.label("sales_agent_id"),
-            Agency.name.label("sales_agent_name"),
-            PpaBundle.area.label("region_name_en"),
-            PpaBundle.area.label("region_name_jp"),
-            PpaBundle.requested_at.label("requested_at"),
-            PpaBundle.request_due_date.label("request_due_date"),
-            PpaBundle.quote_valid_days.label("quote_valid_days"),
-            PpaBundle.contract_start_date.label("contract_start_date"),
-            PpaBundle.quote_status.label("quote_status"),
-            PpaBundle.offer_status.label("offer_status"),
-            PpaBundle.updated_at.label("updated_at"),
-            sp_count,
-            sum_kw,
-        )
-        .join(Plan, Plan.id == PpaBundle.plan_id)
-        .join(Customer, Customer.id == PpaBundle.customer_id)
-        .outerjoin(Agency, Agency.id == PpaBundle.agency_id)
-        .outerjoin(PpaProject, PpaProject.bundle_id == PpaBundle.id)
-        .outerjoin(PpaSupplyPoint, PpaSupplyPoint.bundle_id == PpaBundle.id)
-        .where(PpaBundle.id == bundle_id)
-        .group_by(
-            PpaBundle.id,
-            Plan.id, Plan.name,
-            Customer.name,
-            Agency.id, Agency.name,
-            PpaBundle.area,
-            PpaBundle.requested_at,
-            PpaBundle.request_due_date,
-            PpaBundle.quote_valid_days,
-            PpaBundle.contract_start_date,
-            PpaBundle.quote_status,
-            PpaBundle.offer_status,
-            PpaBundle.updated_at,
-        )
-    )
+    hdr_stmt = sa.select(*HEADER_COLS).where(V.c.id == bundle_id)
 
     hdr_row = (await session.execute(hdr_stmt)).first()
     if not hdr_row:
         raise HTTPException(status_code=404, detail="Bundle not found")
 
-    label, exp_date = _format_quote_valid_until(hdr_row.requested_at, hdr_row.quote_valid_days)
+    await lookups.ensure(
+        session,
+        plan_ids=(hdr_row.plan_id,),
+        customer_ids=(hdr_row.customer_id,),
+        agency_ids=(hdr_row.agency_id,),
+    )
 
     # per-project aggregation (capacity_mw + sp count + sum kw)
     proj_stmt = (
         sa.select(
             PpaProject.id.label("project_id"),
             PpaProject.capacity_mw.label("capacity_mw"),
-            func.count(PpaSupplyPoint.id).label("sp_count"),
-            func.coalesce(func.sum(PpaSupplyPoint.contract_kw), 0.0).label("sum_kw"),
+            # count the join key (non-NULL iff matched) so ix_ppa_sp_project_contract covers it
+            func.count(PpaSupplyPoint.project_id).label("sp_count"),
+            func.coalesce(func.sum(PpaSupplyPoint.contract_kw), 0).label("sum_kw"),
         )
         .outerjoin(PpaSupplyPoint, PpaSupplyPoint.project_id == PpaProject.id)
         .where(PpaProject.bundle_id == bundle_id)
@@ -268,48 +294,22 @@ async def get_ppa_quotation_detail(
     )
     proj_rows = (await session.execute(proj_stmt)).all()
 
-    projects: List[PpaQuotationDetailProject] = []
-    for r in proj_rows:
-        projects.append(
-            PpaQuotationDetailProject(
-                project_id=r.project_id,
-                capacity_mw=float(r.capacity_mw) if r.capacity_mw is not None else None,
-                num_of_spids=int(r.sp_count or 0),
-                contract_power_kw=float(r.sum_kw or 0.0),
-            )
+    # same as the list: values are already typed by the query -> no re-validation
+    projects: List[PpaQuotationDetailProject] = [
+        _construct_project(
+            project_id=r.project_id,
+            capacity_mw=float(r.capacity_mw) if r.capacity_mw is not None else None,
+            num_of_spids=int(r.sp_count or 0),
+            contract_power_kw=float(r.sum_kw or 0.0),
         )
+        for r in proj_rows
+    ]
 
-    detail = PpaQuotationDetail(
-        id=hdr_row.bundle_id,
-        tender_number=_summary_number(hdr_row.bundle_id),
-        customer_name=hdr_row.customer_name,
-        plan_id=hdr_row.plan_id,
-        plan_name_en=hdr_row.plan_name_en,
-        plan_name_jp=hdr_row.plan_name_jp,
-        sales_agent_id=hdr_row.sales_agent_id,
-        sales_agent_name=hdr_row.sales_agent_name,
-        region_id=None,
-        region_name_en=hdr_row.region_name_en,
-        region_name_jp=hdr_row.region_name_jp,
-        quote_request_date=hdr_row.requested_at,
-        last_date_for_quotation=hdr_row.request_due_date,
-        quote_valid_until=label,
-        contract_start_date=hdr_row.contract_start_date,
-        num_of_spids=int(hdr_row.sp_count or 0),
-        peak_demand=None,
-        annual_usage=None,
-        pricing_status_id=1 if str(hdr_row.quote_status or "").lower() in ("pending", "draft", "") else 2,
-        pricing_status_en=str(hdr_row.quote_status or "pending").lower(),
-        pricing_status_jp="保留中" if str(hdr_row.quote_status or "").lower() in ("pending", "draft", "") else "暫定",
-        offer_status_id=1 if str(hdr_row.offer_status or "").lower() in ("pending", "") else 2,
-        offer_status_en=str(hdr_row.offer_status or "pending").lower(),
-        offer_status_jp="保留中" if str(hdr_row.offer_status or "").lower() in ("pending", "") else "確定",
-        last_updated=(hdr_row.updated_at or date.today()).strftime("%Y-%m-%d %H:%M") if hasattr(hdr_row.updated_at, "strftime") else "—",
-        has_quotation_file=False,
-        summary_number=_summary_number(hdr_row.bundle_id),
+    detail = PpaQuotationDetail.model_construct(
+        **_header_fields(hdr_row),
         project_count=len(projects),
-        contract_power_kw=float(hdr_row.sum_kw or 0.0),
-        expiration_date=exp_date,
         projects=projects,
     )
-    return detail
+    # serialize in pydantic-core and hand back the bytes: skips FastAPI's response_model
+    # re-validation + jsonable_encoder walk (response_model stays for the docs)
+    return Response(content=detail.model_dump_json(), media_type="application/json")
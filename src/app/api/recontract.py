@@ -1,81 +1,172 @@
 from __future__ import annotations
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, update
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
 from app.db import get_session
 from app.models import (
     Contract, ContractStatus, RecontractEstimate, RecontractSupplyPoint, RecontractPlant,
-    Plan, Customer, QuoteEffectiveDays
+    QuoteEffectiveDays
 )
 from app.schemas_recontract import RecontractEstimateIn, RecontractEstimateOut
 
 router = APIRouter(prefix="/recontracts", tags=["recontracts"])
 
+# Load only the columns RecontractEstimateOut serializes (skips created_at etc.)
+_ESTIMATE_OUT_OPTIONS = (
+    load_only(
+        RecontractEstimate.id,
+        RecontractEstimate.plan_id,
+        RecontractEstimate.customer_id,
+        RecontractEstimate.desired_quote_date,
+        RecontractEstimate.quote_effective_days,
+        RecontractEstimate.remarks,
+    ),
+    selectinload(RecontractEstimate.supply_points).load_only(
+        RecontractSupplyPoint.id,
+        RecontractSupplyPoint.supply_point_number,
+    ),
+    selectinload(RecontractEstimate.plants).load_only(
+        RecontractPlant.id,
+        RecontractPlant.capacity_mw,
+        RecontractPlant.ppa_unit_price_yen_per_kwh,
+    ),
+)
+
+# FK constraint (PostgreSQL default names) -> payload field it validates
+_FK_FIELDS = {
+    "recontract_estimates_plan_id_fkey": "plan_id",
+    "recontract_estimates_customer_id_fkey": "customer_id",
+}
+
+
+def _constraint_name(exc: IntegrityError) -> Optional[str]:
+    # asyncpg's exception (with .constraint_name) is chained behind SQLAlchemy's DBAPI wrapper
+    return getattr(getattr(exc.orig, "__cause__", None), "constraint_name", None)
+
+
+async def _estimate_in(request: Request) -> RecontractEstimateIn:
+    """
+    Parse the body straight from bytes with pydantic-core (model_validate_json) instead of
+    FastAPI's json.loads -> dict -> validate path. Errors keep FastAPI's 422 shape (loc starts with "body").
+    """
+    try:
+        return RecontractEstimateIn.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        )
+
+
+def _inline_refs(schema: Dict[str, Any]) -> Dict[str, Any]:
+    # openapi_extra is copied into the spec as-is, where "#/$defs/..." wouldn't resolve -> inline them
+    defs = schema.pop("$defs", {})
+
+    def resolve(node: Any) -> Any:
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(defs[node["$ref"].rsplit("/", 1)[-1]])
+            return {k: resolve(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [resolve(v) for v in node]
+        return node
+
+    return resolve(schema)
 
-@router.post("", response_model=RecontractEstimateOut, status_code=status.HTTP_201_CREATED)
-async def create_recontract_estimate(payload: RecontractEstimateIn, session: AsyncSession = Depends(get_session)):
-    # -- Validate FKs so we fail with 400 instead of DB 500 --
-    if not await session.get(Plan, payload.plan_id):
-        raise HTTPException(status_code=400, detail=f"Invalid plan_id: {payload.plan_id}")
-    if not await session.get(Customer, payload.customer_id):
-        raise HTTPException(status_code=400, detail=f"Invalid customer_id: {payload.customer_id}")
 
+# the body isn't a handler parameter any more, so document it explicitly
+_ESTIMATE_IN_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": _inline_refs(RecontractEstimateIn.model_json_schema())}},
+    }
+}
+
+
+@router.post(
+    "",
+    response_model=RecontractEstimateOut,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=_ESTIMATE_IN_BODY,
+)
+async def create_recontract_estimate(
+    payload: RecontractEstimateIn = Depends(_estimate_in),
+    session: AsyncSession = Depends(get_session),
+):
     # -- Coerce enum explicitly (even if schema already did) --
     try:
         qeff = QuoteEffectiveDays(payload.quote_effective_days)
     except Exception:
         raise HTTPException(status_code=400, detail="quote_effective_days must be 30 or 60")
 
-    est = RecontractEstimate(
-        plan_id=payload.plan_id,
-        customer_id=payload.customer_id,
-        desired_quote_date=payload.desired_quote_date,
-        quote_effective_days=qeff,  # ✅ exact enum class
-        remarks=payload.remarks,
-    )
-    session.add(est)
-    await session.flush()  # est.id is available
-
-    # Supply points
-    for sp in payload.supply_points:
-        session.add(RecontractSupplyPoint(estimate_id=est.id, supply_point_number=sp.supply_point_number))
-
-    # Default 0.0 MW + user scenarios
-    session.add(RecontractPlant(estimate_id=est.id, capacity_mw=0.0, ppa_unit_price_yen_per_kwh=None))
-    for p in payload.plants:
-        session.add(RecontractPlant(
-            estimate_id=est.id,
-            capacity_mw=p.capacity_mw,
-            ppa_unit_price_yen_per_kwh=p.ppa_unit_price_yen_per_kwh
-        ))
-
-    # Flip contract status on matching SPNs
-    if payload.supply_points:
-        spns = [sp.supply_point_number for sp in payload.supply_points]
+    # plan_id / customer_id aren't pre-checked: the FK constraints reject bad ids and
+    # the IntegrityError handler below turns them into a 400 (saves 2 round-trips per call)
+    try:
+        est = RecontractEstimate(
+            plan_id=payload.plan_id,
+            customer_id=payload.customer_id,
+            desired_quote_date=payload.desired_quote_date,
+            quote_effective_days=qeff.value,  # plain INTEGER column (CHECK IN (30, 60))
+            remarks=payload.remarks,
+        )
+        session.add(est)
+        await session.flush()  # est.id is available
+
+        # Child rows go in as one multi-row INSERT per table (ORM bulk insert: no per-row
+        # objects / identity map); they're loaded back by the select below.
+        # Supply points
+        if payload.supply_points:
+            await session.execute(
+                insert(RecontractSupplyPoint),
+                [
+                    {"estimate_id": est.id, "supply_point_number": sp.supply_point_number}
+                    for sp in payload.supply_points
+                ],
+            )
+
+        # Default 0.0 MW + user scenarios
         await session.execute(
-            update(Contract)
-            .where(Contract.supply_point_number.in_(spns))
-            .where(Contract.status == ContractStatus.UNDER_CONTRACT)
-            .values(status=ContractStatus.RECONTRACT_ESTIMATE)
+            insert(RecontractPlant),
+            [{"estimate_id": est.id, "capacity_mw": 0.0, "ppa_unit_price_yen_per_kwh": None}]
+            + [
+                {
+                    "estimate_id": est.id,
+                    "capacity_mw": p.capacity_mw,
+                    "ppa_unit_price_yen_per_kwh": p.ppa_unit_price_yen_per_kwh,
+                }
+                for p in payload.plants
+            ],
         )
 
-    try:
+        # Flip contract status on matching SPNs
+        if payload.supply_points:
+            spns = [sp.supply_point_number for sp in payload.supply_points]
+            await session.execute(
+                update(Contract)
+                .where(Contract.supply_point_number.in_(spns))
+                .where(Contract.status == ContractStatus.UNDER_CONTRACT.value)
+                .values(status=ContractStatus.RECONTRACT_ESTIMATE.value)
+            )
+
         await session.commit()
     except IntegrityError as e:
-        # FK violations, enum issues, etc → surface clearly
         await session.rollback()
+        field = _FK_FIELDS.get(_constraint_name(e))
+        if field:
+            raise HTTPException(status_code=400, detail=f"Invalid {field}: {getattr(payload, field)}")
+        # other constraint / enum issues → surface clearly
         raise HTTPException(status_code=400, detail=f"Database constraint error: {str(e.orig)}")
 
     # -- Eager-load relationships before returning (avoids MissingGreenlet) --
     result = await session.execute(
         select(RecontractEstimate)
-        .options(
-            selectinload(RecontractEstimate.supply_points),
-            selectinload(RecontractEstimate.plants),
-        )
+        .options(*_ESTIMATE_OUT_OPTIONS)
         .where(RecontractEstimate.id == est.id)
     )
     est_loaded = result.scalar_one()
@@ -86,10 +177,7 @@ async def create_recontract_estimate(payload: RecontractEstimateIn, session: Asy
 async def get_estimate(estimate_id: int, session: AsyncSession = Depends(get_session)):
     result = await session.execute(
         select(RecontractEstimate)
-        .options(
-            selectinload(RecontractEstimate.supply_points),
-            selectinload(RecontractEstimate.plants),
-        )
+        .options(*_ESTIMATE_OUT_OPTIONS)
         .where(RecontractEstimate.id == estimate_id)
     )
     est = result.scalar_one_or_none()
@@ -0,0 +1,52 @@
+# src/app/cache.py
+from __future__ import annotations
+import hashlib
+from typing import Any, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.settings import settings
+
+
+# None when REDIS_URL isn't set -> every lookup is a miss and the endpoints hit the DB as before
+# Short socket timeouts: a hung / blackholed Redis raises TimeoutError (a RedisError) instead of
+# blocking the request, so the handlers below fall back to the DB.
+redis_client: Optional[Redis] = (
+    Redis.from_url(
+        settings.redis_url,
+        socket_connect_timeout=settings.redis_connect_timeout,
+        socket_timeout=settings.redis_socket_timeout,
+    )
+    if settings.redis_url
+    else None
+)
+
+
+def cache_key(prefix: str, *parts: Any) -> str:
+    """Content-addressed key: sha1 over the request params + the data version stamp."""
+    return f"{prefix}:{hashlib.sha1(repr(parts).encode()).hexdigest()}"
+
+
+async def cache_get(key: str) -> Optional[bytes]:
+    if redis_client is None:
+        return None
+    try:
+        return await redis_client.get(key)
+    except RedisError:
+        # Redis down / slow -> serve from the DB rather than failing the request
+        return None
+
+
+async def cache_set(key: str, value: bytes, ttl_seconds: int) -> None:
+    if redis_client is None:
+        return
+    try:
+        await redis_client.setex(key, ttl_seconds, value)
+    except RedisError:
+        pass
+
+
+async def close_cache() -> None:
+    if redis_client is not None:
+        await redis_client.aclose()
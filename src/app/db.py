@@ -1,16 +1,56 @@
 from __future__ import annotations
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
 from app.settings import settings
 
+
+def _timeouts() -> Dict[str, str]:
+    # kill runaway queries and sessions left "idle in transaction" instead of letting them hold a pool slot
+    return {
+        "statement_timeout": str(settings.db_statement_timeout_ms),
+        "idle_in_transaction_session_timeout": str(settings.db_idle_in_tx_timeout_ms),
+    }
+
+
+def _connect_args() -> Dict[str, Any]:
+    if settings.db_pgbouncer:
+        # prepared statements don't survive PgBouncer handing the server connection to another client
+        return {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    return {
+        "statement_cache_size": 2048,           # asyncpg's per-connection prepared statement LRU
+        "prepared_statement_cache_size": 512,   # SQLAlchemy asyncpg adapter cache
+        # short OLTP queries: JIT compilation costs more than it saves
+        "server_settings": {"jit": "off", **_timeouts()},
+    }
+
+
 engine = create_async_engine(
     settings.database_url,
     echo=False,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
     pool_pre_ping=True,
+    pool_recycle=settings.db_pool_recycle,
+    query_cache_size=settings.db_query_cache_size,
+    connect_args=_connect_args(),
 )
 
+if settings.db_pgbouncer:
+    # PgBouncer rejects unknown startup parameters, and in transaction mode a session-level SET
+    # would stick to whichever server connection ran it. Apply the limits per transaction instead:
+    # set_config(..., is_local => true) == SET LOCAL, one extra statement at the start of each transaction.
+    _SET_LOCAL_TIMEOUTS = "SELECT " + ", ".join(
+        f"set_config('{name}', '{value}', true)" for name, value in _timeouts().items()
+    )
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _set_local_timeouts(conn) -> None:
+        conn.exec_driver_sql(_SET_LOCAL_TIMEOUTS)
+
 SessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
@@ -0,0 +1,68 @@
+# src/app/lookups.py
+from __future__ import annotations
+import asyncio
+import time
+from typing import Dict, Iterable, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Plan, Customer, Agency
+
+
+class NameLookup:
+    """
+    In-process id -> name maps for the small reference tables (plans / customers / agencies).
+
+    Loaded lazily on first use so list/detail queries don't have to JOIN these tables on
+    every page. The maps are reloaded when they are older than `ttl_seconds` or when a query
+    returns an id we haven't seen yet (e.g. a customer created after boot).
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.plans: Dict[int, str] = {}
+        self.customers: Dict[int, str] = {}
+        self.agencies: Dict[int, str] = {}
+        self._loaded_at: Optional[float] = None
+        # one reload at a time; concurrent requests wait for it instead of each querying the DB
+        self._lock = asyncio.Lock()
+
+    async def refresh(self, session: AsyncSession) -> None:
+        self.plans = dict((await session.execute(sa.select(Plan.id, Plan.name))).all())
+        self.customers = dict((await session.execute(sa.select(Customer.id, Customer.name))).all())
+        self.agencies = dict((await session.execute(sa.select(Agency.id, Agency.name))).all())
+        self._loaded_at = time.monotonic()
+
+    async def ensure(
+        self,
+        session: AsyncSession,
+        plan_ids: Iterable[int] = (),
+        customer_ids: Iterable[int] = (),
+        agency_ids: Iterable[Optional[int]] = (),
+    ) -> None:
+        """Reload the maps if they are stale or missing any of the given ids."""
+        plan_ids, customer_ids, agency_ids = tuple(plan_ids), tuple(customer_ids), tuple(agency_ids)
+        if not self._needs_refresh(plan_ids, customer_ids, agency_ids):
+            return
+        async with self._lock:
+            # another request may have reloaded while we waited
+            if self._needs_refresh(plan_ids, customer_ids, agency_ids):
+                await self.refresh(session)
+
+    def _needs_refresh(
+        self,
+        plan_ids: Iterable[int],
+        customer_ids: Iterable[int],
+        agency_ids: Iterable[Optional[int]],
+    ) -> bool:
+        stale = self._loaded_at is None or (time.monotonic() - self._loaded_at) > self.ttl_seconds
+        return (
+            stale
+            or any(i not in self.plans for i in plan_ids)
+            or any(i not in self.customers for i in customer_ids)
+            or any(i is not None and i not in self.agencies for i in agency_ids)
+        )
+
+
+lookups = NameLookup()
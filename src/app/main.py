@@ -1,11 +1,33 @@
 # src/app/main.py
 from __future__ import annotations
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from app.api.ppa_quotations import router as ppa_router
 from app.api.recontract import router as recontract_router  # keep your recontract API
+from app.cache import close_cache
+from app.db import engine
+from app.settings import get_settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # the plan / customer / agency name cache loads on first use (lookups.ensure), so a
+    # worker still boots while the DB is unreachable
+    yield
+    await close_cache()
+    # close pooled connections (and their prepared-statement caches) on shutdown / reload
+    await engine.dispose()
 
-app = FastAPI(title="FastAPI with uv (Postgres)")
+
+app = FastAPI(
+    title=get_settings().app_name,
+    lifespan=lifespan,
+    # orjson encodes the large list payloads (dates, floats) much faster than stdlib json
+    default_response_class=ORJSONResponse,
+)
 
 app.include_router(ppa_router)           # ✅ only this for quotations
 app.include_router(recontract_router)
@@ -13,3 +35,16 @@ app.include_router(recontract_router)
 @app.get("/healthz")
 async def healthz():
     return {"ok": True}
+
+
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    # connection pool counters for tuning DB_POOL_SIZE / DB_MAX_OVERFLOW under load
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "timeout": pool.timeout(),
+    }
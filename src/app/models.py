@@ -1,18 +1,30 @@
 # src/app/models.py
 from __future__ import annotations
 from datetime import date, datetime
+from decimal import Decimal
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, Type
 
 from sqlalchemy import (
-    String, Integer, Float, Date, DateTime, ForeignKey, Enum as SAEnum,
-    Boolean, UniqueConstraint, text, func
+    String, Integer, BigInteger, Numeric, Date, DateTime, ForeignKey, CheckConstraint, Index, UniqueConstraint,
+    MetaData, Table, Column, Computed, text, func
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
 class Base(DeclarativeBase):
-    pass
+    # kW / MW / yen quantities: fixed-point so SUM()s are exact (converted to float only in the API layer)
+    type_annotation_map = {Decimal: Numeric(12, 4)}
+
+
+def _check_in(column: str, enum_cls: Type[Enum], name: str) -> CheckConstraint:
+    """
+    CHECK (column IN (...)) built from a Python Enum's values.
+    Status-like columns are plain VARCHAR/INTEGER + CHECK instead of native PG enums, so rows
+    come back as plain str/int (no per-row Enum conversion); the Enum classes stay the API contract.
+    """
+    values = ", ".join(f"'{e.value}'" if isinstance(e.value, str) else str(e.value) for e in enum_cls)
+    return CheckConstraint(f"{column} IN ({values})", name=name)
 
 
 # ----- Reference / master tables -----
@@ -35,7 +47,12 @@ class Customer(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(200), index=True)
     agency_id: Mapped[Optional[int]] = mapped_column(ForeignKey("agencies.id"))
-    agency: Mapped[Optional[Agency]] = relationship(lazy="selectin")
+    agency: Mapped[Optional[Agency]] = relationship()
+
+    # name ILIKE '%foo%' search (needs the pg_trgm extension)
+    __table_args__ = (
+        Index("ix_customers_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
 
 class ContractStatus(str, Enum):
@@ -61,31 +78,36 @@ class Contract(Base):
     supply_point_number: Mapped[str] = mapped_column(String(64), index=True)
     start_date: Mapped[date]
     end_date: Mapped[date]
-    negotiated_power_kw: Mapped[Optional[float]] = mapped_column()
-    status: Mapped[ContractStatus] = mapped_column(SAEnum(ContractStatus, name="contractstatus"))
+    negotiated_power_kw: Mapped[Optional[Decimal]] = mapped_column()
+    status: Mapped[str] = mapped_column(String(32))  # ContractStatus
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=False),
         nullable=False,
         server_default=text("now()")
     )
 
-    customer: Mapped[Customer] = relationship(lazy="selectin")
-    plan: Mapped[Plan] = relationship(lazy="selectin")
+    customer: Mapped[Customer] = relationship()
+    plan: Mapped[Plan] = relationship()
     ancillary_contracts: Mapped[List["AncillaryContract"]] = relationship(
-        back_populates="contract", cascade="all,delete-orphan", lazy="selectin"
+        back_populates="contract", cascade="all,delete-orphan",
     )
 
-    __table_args__ = (UniqueConstraint("supply_point_number", "end_date", name="uq_contract_spn_end"),)
+    __table_args__ = (
+        UniqueConstraint("supply_point_number", "end_date", name="uq_contract_spn_end"),
+        _check_in("status", ContractStatus, name="ck_contract_status"),
+    )
 
 
 class AncillaryContract(Base):
     __tablename__ = "ancillary_contracts"
     id: Mapped[int] = mapped_column(primary_key=True)
     contract_id: Mapped[int] = mapped_column(ForeignKey("contracts.id"), index=True)
-    type: Mapped[AncillaryType] = mapped_column(SAEnum(AncillaryType, name="ancillarytype"))
-    unit_price: Mapped[Optional[float]] = mapped_column()
+    type: Mapped[str] = mapped_column(String(32))  # AncillaryType
+    unit_price: Mapped[Optional[Decimal]] = mapped_column()
 
-    contract: Mapped[Contract] = relationship(back_populates="ancillary_contracts", lazy="selectin")
+    contract: Mapped[Contract] = relationship(back_populates="ancillary_contracts")
+
+    __table_args__ = (_check_in("type", AncillaryType, name="ck_ancillary_contract_type"),)
 
 
 # ----- Re-contract estimate -----
@@ -101,7 +123,7 @@ class RecontractEstimate(Base):
     customer_id: Mapped[int] = mapped_column(ForeignKey("customers.id"), index=True)
     plan_id: Mapped[int] = mapped_column(ForeignKey("plans.id"))
     desired_quote_date: Mapped[date]
-    quote_effective_days: Mapped[QuoteEffectiveDays] = mapped_column(SAEnum(QuoteEffectiveDays, name="quoteeffectivedays"))
+    quote_effective_days: Mapped[int] = mapped_column(Integer)  # QuoteEffectiveDays (30 / 60)
     remarks: Mapped[Optional[str]] = mapped_column(String(500))
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=False),
@@ -109,13 +131,17 @@ class RecontractEstimate(Base):
         server_default=text("now()")
     )
 
-    customer: Mapped[Customer] = relationship(lazy="selectin")
-    plan: Mapped[Plan] = relationship(lazy="selectin")
+    customer: Mapped[Customer] = relationship()
+    plan: Mapped[Plan] = relationship()
     supply_points: Mapped[List["RecontractSupplyPoint"]] = relationship(
-        back_populates="estimate", cascade="all,delete-orphan", lazy="selectin"
+        back_populates="estimate", cascade="all,delete-orphan",
     )
     plants: Mapped[List["RecontractPlant"]] = relationship(
-        back_populates="estimate", cascade="all,delete-orphan", lazy="selectin"
+        back_populates="estimate", cascade="all,delete-orphan",
+    )
+
+    __table_args__ = (
+        _check_in("quote_effective_days", QuoteEffectiveDays, name="ck_recontract_estimate_quote_effective_days"),
     )
 
 
@@ -124,17 +150,17 @@ class RecontractSupplyPoint(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     estimate_id: Mapped[int] = mapped_column(ForeignKey("recontract_estimates.id"), index=True)
     supply_point_number: Mapped[str] = mapped_column(String(64))
-    estimate: Mapped[RecontractEstimate] = relationship(back_populates="supply_points", lazy="selectin")
+    estimate: Mapped[RecontractEstimate] = relationship(back_populates="supply_points")
 
 
 class RecontractPlant(Base):
     __tablename__ = "recontract_plants"
     id: Mapped[int] = mapped_column(primary_key=True)
     estimate_id: Mapped[int] = mapped_column(ForeignKey("recontract_estimates.id"), index=True)
-    capacity_mw: Mapped[float]
-    ppa_unit_price_yen_per_kwh: Mapped[Optional[float]]
+    capacity_mw: Mapped[Decimal]
+    ppa_unit_price_yen_per_kwh: Mapped[Optional[Decimal]]
 
-    estimate: Mapped[RecontractEstimate] = relationship(back_populates="plants", lazy="selectin")
+    estimate: Mapped[RecontractEstimate] = relationship(back_populates="plants")
 
 
 # --- PPA (bundle / project) -----------------------------------------------
@@ -162,7 +188,7 @@ class PpaBundle(Base):
     customer_id: Mapped[int] = mapped_column(ForeignKey("customers.id"))
     agency_id: Mapped[Optional[int]] = mapped_column(ForeignKey("agencies.id"))
     plan_id: Mapped[int] = mapped_column(ForeignKey("plans.id"))
-    voltage: Mapped[VoltageLevel] = mapped_column(SAEnum(VoltageLevel, name="voltagelevel"))
+    voltage: Mapped[str] = mapped_column(String(32))  # VoltageLevel
     area: Mapped[str] = mapped_column(String(32))  # e.g., KANTO
     prev_supplier_plan: Mapped[Optional[str]] = mapped_column(String(120))
 
@@ -170,61 +196,133 @@ class PpaBundle(Base):
     quote_valid_days: Mapped[Optional[int]]
     requested_at: Mapped[Optional[date]]
     request_due_date: Mapped[Optional[date]]
+    # generated by PostgreSQL on write; NULL when either input is missing / 0 days
+    expiration_date: Mapped[Optional[date]] = mapped_column(
+        Date, Computed("requested_at + NULLIF(quote_valid_days, 0)", persisted=True)
+    )
 
-    quote_status: Mapped[QuoteStatus] = mapped_column(SAEnum(QuoteStatus, name="ppaqstatus"), default=QuoteStatus.DRAFT)
-    offer_status: Mapped[OfferStatus] = mapped_column(SAEnum(OfferStatus, name="ppaofferstatus"), default=OfferStatus.NONE)
+    quote_status: Mapped[str] = mapped_column(
+        String(32), default=QuoteStatus.DRAFT.value, server_default=text("'DRAFT'")
+    )  # QuoteStatus
+    offer_status: Mapped[str] = mapped_column(
+        String(32), default=OfferStatus.NONE.value, server_default=text("'NONE'")
+    )  # OfferStatus
+
+    # Denormalized aggregates for the list screen. Maintained by DB triggers on ppa_projects /
+    # ppa_supply_points (see migration 20261016_ppa_bundle_aggregates) — don't write them from the app.
+    project_count: Mapped[int] = mapped_column(Integer, default=0, server_default=text("0"))
+    num_of_spids: Mapped[int] = mapped_column(Integer, default=0, server_default=text("0"))
+    contract_power_kw: Mapped[Decimal] = mapped_column(default=Decimal(0), server_default=text("0"))
+    # bumped by a BEFORE UPDATE trigger on every row update (incl. the aggregate recompute);
+    # part of the list cache's version stamp
+    list_version: Mapped[int] = mapped_column(BigInteger, default=0, server_default=text("0"))
 
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
-    customer: Mapped["Customer"] = relationship(lazy="selectin")
-    agency: Mapped[Optional["Agency"]] = relationship(lazy="selectin")
-    plan: Mapped["Plan"] = relationship(lazy="selectin")
+    customer: Mapped["Customer"] = relationship()
+    agency: Mapped[Optional["Agency"]] = relationship()
+    plan: Mapped["Plan"] = relationship()
 
     projects: Mapped[List["PpaProject"]] = relationship(
         back_populates="bundle",
         cascade="all,delete-orphan",
-        lazy="selectin"
     )
     supply_points: Mapped[List["PpaSupplyPoint"]] = relationship(
         back_populates="bundle",
         cascade="all,delete-orphan",
-        lazy="selectin"
     )
 
+    __table_args__ = (
+        _check_in("voltage", VoltageLevel, name="ck_ppa_bundle_voltage"),
+        _check_in("quote_status", QuoteStatus, name="ck_ppa_bundle_quote_status"),
+        _check_in("offer_status", OfferStatus, name="ck_ppa_bundle_offer_status"),
+    )
+
+# List endpoint: filter on customer/agency/area, ORDER BY updated_at DESC, id DESC
+Index("ix_ppa_bundles_updated_at_id", PpaBundle.updated_at.desc(), PpaBundle.id.desc())
+Index("ix_ppa_bundles_customer_updated", PpaBundle.customer_id, PpaBundle.updated_at.desc())
+Index("ix_ppa_bundles_agency_updated", PpaBundle.agency_id, PpaBundle.updated_at.desc())
+Index("ix_ppa_bundles_area_updated", PpaBundle.area, PpaBundle.updated_at.desc())
+
 class PpaProject(Base):
     __tablename__ = "ppa_projects"
     id: Mapped[int] = mapped_column(primary_key=True)  # Project number
-    bundle_id: Mapped[int] = mapped_column(ForeignKey("ppa_bundles.id"), index=True)
-    capacity_mw: Mapped[float]
-    ppa_unit_price_yen_per_kwh: Mapped[Optional[float]]
+    bundle_id: Mapped[int] = mapped_column(ForeignKey("ppa_bundles.id"))
+    capacity_mw: Mapped[Decimal]
+    ppa_unit_price_yen_per_kwh: Mapped[Optional[Decimal]]
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
-    bundle: Mapped["PpaBundle"] = relationship(back_populates="projects", lazy="selectin")
+    bundle: Mapped["PpaBundle"] = relationship(back_populates="projects")
 
     # NEW: access SPs under this project
     supply_points: Mapped[List["PpaSupplyPoint"]] = relationship(
         back_populates="project",
-        lazy="selectin"
+    )
+
+    # covers per-bundle project counts / capacity reads without heap fetches
+    __table_args__ = (
+        Index("ix_ppa_projects_bundle_capacity", "bundle_id", postgresql_include=["capacity_mw"]),
     )
 
 class PpaSupplyPoint(Base):
     __tablename__ = "ppa_supply_points"
     id: Mapped[int] = mapped_column(primary_key=True)
-    bundle_id: Mapped[int] = mapped_column(ForeignKey("ppa_bundles.id"), index=True)
+    bundle_id: Mapped[int] = mapped_column(ForeignKey("ppa_bundles.id"))
 
     # NEW: link SP to a specific project (nullable so legacy rows still valid)
     project_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("ppa_projects.id"),
-        index=True,
         nullable=True
     )
 
     name: Mapped[str] = mapped_column(String(200))
     address: Mapped[Optional[str]] = mapped_column(String(300))
     supply_point_number: Mapped[Optional[str]] = mapped_column(String(64), index=True)
-    contract_kw: Mapped[Optional[float]]
+    contract_kw: Mapped[Optional[Decimal]]
 
-    bundle: Mapped["PpaBundle"] = relationship(back_populates="supply_points", lazy="selectin")
+    bundle: Mapped["PpaBundle"] = relationship(back_populates="supply_points")
     # NEW relationship back to project
-    project: Mapped[Optional["PpaProject"]] = relationship(back_populates="supply_points", lazy="selectin")
+    project: Mapped[Optional["PpaProject"]] = relationship(back_populates="supply_points")
+
+    # index-only COUNT(*) / SUM(contract_kw) per bundle (list) and per project (detail)
+    __table_args__ = (
+        Index("ix_ppa_sp_bundle_contract", "bundle_id", postgresql_include=["contract_kw"]),
+        Index("ix_ppa_sp_project_contract", "project_id", postgresql_include=["contract_kw"]),
+        # case-insensitive prefix search: lower(supply_point_number) LIKE 'abc%'
+        # (text_pattern_ops so LIKE can use the btree under a non-C collation)
+        Index(
+            "ix_ppa_sp_number_lower",
+            func.lower(text("supply_point_number")).label("spn_lower"),
+            postgresql_ops={"spn_lower": "text_pattern_ops"},
+        ),
+    )
+
+
+# --- Read-only views --------------------------------------------------------
+# Kept on their own MetaData so create_all() / alembic autogenerate never treat them as tables.
+
+view_metadata = MetaData()
+
+# One row per bundle with the list screen's derived columns (see 20261016_create_v_ppa_quotation_list)
+ppa_quotation_list_view = Table(
+    "v_ppa_quotation_list",
+    view_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("customer_id", Integer),
+    Column("agency_id", Integer),
+    Column("plan_id", Integer),
+    Column("area", String(32)),
+    Column("requested_at", Date),
+    Column("request_due_date", Date),
+    Column("quote_valid_days", Integer),
+    Column("contract_start_date", Date),
+    Column("quote_status", String(32)),
+    Column("offer_status", String(32)),
+    Column("updated_at", DateTime),
+    Column("project_count", Integer),
+    Column("num_of_spids", Integer),
+    Column("contract_power_kw", Numeric(12, 4)),
+    Column("expiration_date", Date),
+    Column("quote_valid_until", String),  # 'YYYY-MM-DD (N日)' or ''
+)
@@ -0,0 +1,22 @@
+# src/app/schemas_base.py
+from __future__ import annotations
+
+from pydantic import BaseModel, ConfigDict
+
+
+class BaseSchema(BaseModel):
+    """
+    Common base for the API schemas.
+    from_attributes: build Out models straight from ORM objects / Row results.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ResponseSchema(BaseSchema):
+    """
+    Read-only response rows: built once (usually via model_construct) and only serialized after that.
+    frozen=True just rejects attribute assignment after construction; it doesn't make the rows
+    hashable (several fields are lists) or faster. The PPA routes return the serialized bytes
+    themselves, so their response_model is only used for the OpenAPI schema.
+    """
+    model_config = ConfigDict(frozen=True)
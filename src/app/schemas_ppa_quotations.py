@@ -2,11 +2,12 @@
 from __future__ import annotations
 from datetime import date
 from typing import List, Optional
-from pydantic import BaseModel
+
+from app.schemas_base import ResponseSchema
 
 
 # -------- List row (BizQ-compatible, plus a few additions we discussed) --------
-class PpaQuotationListItem(BaseModel):
+class PpaQuotationListItem(ResponseSchema):
     id: int
     tender_number: str
     customer_name: str
@@ -50,28 +51,25 @@ class PpaQuotationListItem(BaseModel):
     contract_power_kw: float
     expiration_date: Optional[date] = None
 
-    class Config:
-        from_attributes = True
-
 
-class PpaQuotationListResponse(BaseModel):
-    total_count: int
-    filtered_count: int
+class PpaQuotationListResponse(ResponseSchema):
+    # None on ?after= pages (counted once, on the first page)
+    total_count: Optional[int] = None
+    filtered_count: Optional[int] = None
     data: List[PpaQuotationListItem]
+    # pass as ?after= to fetch the next page by keyset (None on the last page / non-default sort)
+    next_cursor: Optional[str] = None
 
 
 # -------- Detail models (header + per-project rows) --------
-class PpaQuotationDetailProject(BaseModel):
+class PpaQuotationDetailProject(ResponseSchema):
     project_id: int
     capacity_mw: Optional[float] = None
     num_of_spids: int
     contract_power_kw: float
 
-    class Config:
-        from_attributes = True
 
-
-class PpaQuotationDetail(BaseModel):
+class PpaQuotationDetail(ResponseSchema):
     # Header fields (same as list item + extras)
     id: int
     tender_number: str
@@ -116,6 +114,3 @@ class PpaQuotationDetail(BaseModel):
 
     # Children (capacity-split projects)
     projects: List[PpaQuotationDetailProject]
-
-    class Config:
-        from_attributes = True
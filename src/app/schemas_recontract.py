@@ -1,16 +1,19 @@
 from __future__ import annotations
-from datetime import date
+from datetime import date, timedelta
 from typing import List, Optional
 
-from pydantic import BaseModel, Field, field_validator
-from app.models import QuoteEffectiveDays  # ✅ import the SAME enum used by the ORM
+from pydantic import Field, field_validator
+from app.models import QuoteEffectiveDays  # ✅ import the SAME enum the DB CHECK constraint is built from
+from app.schemas_base import BaseSchema
 
+_ONE_MONTH = timedelta(days=31)  # desired_quote_date window
 
-class SupplyPointIn(BaseModel):
+
+class SupplyPointIn(BaseSchema):
     supply_point_number: str = Field(min_length=1, max_length=64)
 
 
-class PlantIn(BaseModel):
+class PlantIn(BaseSchema):
     capacity_mw: float = Field(ge=0.0)
     ppa_unit_price_yen_per_kwh: Optional[float] = Field(default=None, ge=0.0)
 
@@ -20,11 +23,11 @@ class PlantIn(BaseModel):
         return round(v, 1)
 
 
-class RecontractEstimateIn(BaseModel):
+class RecontractEstimateIn(BaseSchema):
     plan_id: int
     customer_id: int
     desired_quote_date: date
-    quote_effective_days: QuoteEffectiveDays  # ✅ exact ORM enum
+    quote_effective_days: QuoteEffectiveDays  # ✅ same enum as the DB CHECK
     remarks: Optional[str] = Field(default=None, max_length=500)
     supply_points: List[SupplyPointIn] = Field(min_length=1, max_length=20)
     plants: List[PlantIn] = Field(default_factory=list, max_length=3)
@@ -32,34 +35,29 @@ class RecontractEstimateIn(BaseModel):
     @field_validator("desired_quote_date")
     @classmethod
     def within_one_month(cls, v: date) -> date:
-        from datetime import date as _date, timedelta as _timedelta
-        today = _date.today()
-        if v < today or v > (today + _timedelta(days=31)):
+        today = date.today()
+        if not (today <= v <= today + _ONE_MONTH):
             raise ValueError("desired_quote_date must be between today and +31 days")
         return v
 
 
 class SupplyPointOut(SupplyPointIn):
     id: int
-    model_config = {"from_attributes": True}
 
 
-class PlantOut(BaseModel):
+class PlantOut(BaseSchema):
     id: int
     capacity_mw: float
     ppa_unit_price_yen_per_kwh: Optional[float]
-    model_config = {"from_attributes": True}
 
 
-class RecontractEstimateOut(BaseModel):
+class RecontractEstimateOut(BaseSchema):
     id: int
     plan_id: int
     customer_id: int
     desired_quote_date: date
-    # Pydantic will serialize Enum[int] as its .value (30/60) when field is int:
+    # stored as a plain INTEGER (30 / 60) -> no enum conversion on the way out
     quote_effective_days: int
     remarks: Optional[str] = None
     supply_points: List[SupplyPointOut]
     plants: List[PlantOut]
-
-    model_config = {"from_attributes": True}